@@ -107,7 +107,7 @@ class RubiksApp:
         
         self.img_rgb = img_rgb  # Store img_rgb as an instance variable
         
-        img_guidelines = guidelines(img_rgb.copy())
+        img_guidelines = guidelines(img_rgb)
         img_tk = ImageTk.PhotoImage(image=Image.fromarray(img_guidelines))
         self.video_label.config(image=img_tk)
         self.video_label.img = img_tk
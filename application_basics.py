@@ -179,12 +179,15 @@ def main():
 
         cv2.imshow(('VIDEO FEED'), img_guidelines) 
         
+        # Poll the keyboard once per frame.
+        key = cv2.waitKey(1) & 0xFF
+
         # Use Q to quit.
-        if cv2.waitKey(81)  == ord('q'):
+        if key == ord('q'):
             break
 
         # Use P to capture and process images.
-        if cv2.waitKey(80) == ord('p'):
+        elif key == ord('p'):
 
             # Convert Camera BGR to Image RGB
             img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
@@ -188,12 +188,11 @@ def capture_cube_face(center_color: str, face_name: str, model) -> tuple[str, st
     # Image capture loop
     while result:
         # Capture video frame by frame
-        result, img = cam.read()  # Create a copy of the captured image as disp_img.
-        disp_img = img.copy()
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        result, img = cam.read()
 
-        # Place guidelines on the copied image
-        disp_img = guidelines(disp_img)
+        # Place guidelines on a copy of the image
+        disp_img = guidelines(img)
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
         # Display the resulting image with guidelines
         cv2.imshow('VIDEO FEED', disp_img)
@@ -238,12 +237,11 @@ def capture_cube_face(center_color: str, face_name: str, model) -> tuple[str, st
             # Image capture loop
             while result:
                 # Capture video frame by frame
-                result, img = cam.read()  # Create a copy of the captured image as disp_img.
-                disp_img = img.copy()
-                img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                result, img = cam.read()
 
-                # Place guidelines on the copied image
-                disp_img = guidelines(disp_img)
+                # Place guidelines on a copy of the image
+                disp_img = guidelines(img)
+                img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
                 # Display the resulting image with guidelines
                 cv2.imshow('VIDEO FEED', disp_img)
@@ -7,7 +7,10 @@ While it was ultimately scrapped in favor of an AI-based project, this was the c
 """
 
 ### IMPORT ###
-import time
+import functools
+import queue
+import threading
+import traceback
 import cv2
 import numpy as np
 import pandas as pd
@@ -39,6 +42,17 @@ elif square2 == square1 - 2:
     square2 is UP_RIGHT of square1
 '''
 
+# Whether detect_edges runs on OpenCL (e.g. an otherwise idle integrated GPU). Off by default; only the __main__ block
+# reassigns it, so it only takes effect when this file is run as a script, not when it is imported.
+USE_OPENCL = False
+
+# Largest distance (in pixels) between the first and last points of a contour for it to count as closed.
+CLOSED_TOLERANCE = 30
+
+# Scratch buffers that guidelines() and detect_edges() write into, reused between frames of the same shape.
+_GUIDELINE_BUF = None
+_GRAY_BUF = None
+
 ### FUNC ###
 def get_center(contour:np.ndarray) -> tuple[int, int]:
     '''
@@ -246,24 +260,17 @@ def geometry_fill_in(label_key:dict[int:int], sticker_contours:list[np.ndarray],
 
     return label_key2, sticker_contours
 
-def guidelines(img:np.array) -> np.array:
+@functools.lru_cache(maxsize=4)
+def _guideline_coords(imgheight:int, imgwidth:int) -> tuple[int, int, int]:
     '''
-    A function that applies guidelines to a raw image.
-
-    Input:
-    img (np.ndarray):               A raw RGB image of a face of a Rubik's Cube.
+    A function that computes the center region used by guidelines and identify_stickers.
+    The camera resolution is fixed for a session, so the result is cached per (imgheight, imgwidth).
 
     Output:
-    img_guidelines (np.ndarray):    A copy of img with guidelines over its center portion.
-
-    Guidelines are placed using a cropping algorithm identical to identify_stickers.
+    border_top (int):       The row where the center region starts.
+    border_side (int):      The column where the center region starts.
+    center_width (int):     The side length of the (square) center region.
     '''
-    # Get the dimensions to crop the img to its center plus some bound of error, adjusted dynamically by resolution.
-    imgheight, imgwidth, depth = np.shape(img)
-    
-    img_guidelines = np.copy(img)
-    WHITE = [255, 255, 255]
-
     if imgwidth >= imgheight:
         larger_side = imgwidth
         smaller_side = imgheight
@@ -272,30 +279,6 @@ def guidelines(img:np.array) -> np.array:
         border_side = (larger_side)//2-3*border_top
         center_width = 6*border_top
 
-        # Horizontal borders.
-
-        # Top
-        img_guidelines[border_top][border_side:border_side+center_width] = WHITE
-
-        # Thirds
-        img_guidelines[border_top+center_width//3][border_side:border_side+center_width] = WHITE
-        img_guidelines[border_top+2*center_width//3][border_side:border_side+center_width] = WHITE
-
-        # Bottom 
-        img_guidelines[border_top+center_width][border_side:border_side+center_width] = WHITE
-
-        # Vertical borders.
-
-        # Left
-        img_guidelines[border_top:border_top+center_width,border_side] = WHITE
-
-        # Thirds
-        img_guidelines[border_top:border_top+center_width,border_side+center_width//3] = WHITE
-        img_guidelines[border_top:border_top+center_width,border_side+2*center_width//3] = WHITE
-
-        # Right
-        img_guidelines[border_top:border_top+center_width,border_side+center_width] = WHITE
-
     elif imgwidth < imgheight:
         larger_side = imgheight
         smaller_side = imgwidth
@@ -304,29 +287,60 @@ def guidelines(img:np.array) -> np.array:
         border_top = (larger_side)//2-3*border_side
         center_width = 6*border_side
 
-        # Horizontal borders.
+    return border_top, border_side, center_width
 
-        # Top
-        img_guidelines[border_top][border_side:border_side+center_width] = WHITE
+@functools.lru_cache(maxsize=4)
+def _crop_params(imgheight:int, imgwidth:int) -> tuple[slice, slice, int]:
+    '''
+    A function that builds the crop used by identify_stickers, cached per (imgheight, imgwidth).
 
-        # Thirds
-        img_guidelines[border_top+center_width//3][border_side:border_side+center_width] = WHITE
-        img_guidelines[border_top+2*center_width//3][border_side:border_side+center_width] = WHITE
+    Output:
+    rows (slice):               The rows of the center region.
+    cols (slice):               The columns of the center region.
+    true_center_width (int):    The width the cube itself should take up: the middle two-thirds of the center region.
+    '''
+    border_top, border_side, center_width = _guideline_coords(imgheight, imgwidth)
 
-        # Bottom 
-        img_guidelines[border_top+center_width][border_side:border_side+center_width] = WHITE
+    return slice(border_top, border_top+center_width), slice(border_side, border_side+center_width), 2*center_width//3
 
-        # Vertical borders.
+def guidelines(img:np.array) -> np.array:
+    '''
+    A function that applies guidelines to a raw image.
+
+    Input:
+    img (np.ndarray):               A raw RGB image of a face of a Rubik's Cube.
+
+    Output:
+    img_guidelines (np.ndarray):    A copy of img with guidelines over its center portion.
+
+    Guidelines are placed using a cropping algorithm identical to identify_stickers.
+    The copy is a module-level buffer that is overwritten by the next call, so it should be displayed (or copied) before then.
+    '''
+    global _GUIDELINE_BUF
 
-        # Left
-        img_guidelines[border_top:border_top+center_width,border_side] = WHITE
+    # Get the dimensions to crop the img to its center plus some bound of error, adjusted dynamically by resolution.
+    imgheight, imgwidth, depth = img.shape
+    
+    # Reuse the scratch buffer instead of allocating a new copy every frame.
+    if _GUIDELINE_BUF is None or _GUIDELINE_BUF.shape != img.shape or _GUIDELINE_BUF.dtype != img.dtype:
+        _GUIDELINE_BUF = np.empty_like(img)
+    np.copyto(_GUIDELINE_BUF, img)
+    img_guidelines = _GUIDELINE_BUF
+    WHITE = (255, 255, 255)
+
+    border_top, border_side, center_width = _guideline_coords(imgheight, imgwidth)
 
-        # Thirds
-        img_guidelines[border_top:border_top+center_width,border_side+center_width//3] = WHITE
-        img_guidelines[border_top:border_top+center_width,border_side+2*center_width//3] = WHITE
+    # Corners of the center region.
+    x0, y0 = border_side, border_top
+    x1, y1 = x0+center_width, y0+center_width
 
-        # Right
-        img_guidelines[border_top:border_top+center_width,border_side+center_width] = WHITE
+    # Horizontal borders: top, thirds, bottom.
+    for y in (y0, y0+center_width//3, y0+2*center_width//3, y1):
+        cv2.line(img_guidelines, (x0, y), (x1, y), WHITE, 1)
+
+    # Vertical borders: left, thirds, right.
+    for x in (x0, x0+center_width//3, x0+2*center_width//3, x1):
+        cv2.line(img_guidelines, (x, y0), (x, y1), WHITE, 1)
 
     return img_guidelines
 
@@ -335,19 +349,31 @@ def detect_edges(img:np.ndarray, lower:int=0, upper:int=100) -> np.ndarray:
     A function that applies Canny Edge Detection to an image.
 
     Input:
-    img (np.ndarray):           An RGB image.
-    lower (int, default 50):    OPTIONAL, The lower threshold for cv2.Canny.
-    upper (int, default 150):   OPTIONAL, The upper threshold for cv2.Canny.
+    img (np.ndarray):           An RGB image, or an image that is already single-channel grayscale.
+    lower (int, default 0):     OPTIONAL, The lower threshold for cv2.Canny.
+    upper (int, default 100):   OPTIONAL, The upper threshold for cv2.Canny.
 
 
     Output:
     canny (np.ndarray):   A 1-bit color array of the edges in img.
 
-    img is converted to grayscale, and Gaussian Blur is applied in order to reduce noise.
-    Canny edge detection is then applied to the denoised image.
+    img is converted to grayscale (skipped if it has a single channel), and Canny edge detection is applied to it directly, with no blur pass.
+    If USE_OPENCL is set, both steps run on the OpenCL device through cv2.UMat instead.
     '''
-    # convert the image to grayscale
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    global _GRAY_BUF
+
+    if USE_OPENCL:
+        img_umat = cv2.UMat(img)
+        gray = img_umat if img.ndim == 2 else cv2.cvtColor(img_umat, cv2.COLOR_BGR2GRAY)
+        return cv2.Canny(gray, lower, upper).get()
+
+    # convert the image to grayscale into the scratch buffer, unless it already is
+    if img.ndim == 2:
+        gray = img
+    else:
+        if _GRAY_BUF is None or _GRAY_BUF.shape != img.shape[:2]:
+            _GRAY_BUF = np.empty(img.shape[:2], dtype=np.uint8)
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=_GRAY_BUF)
     
     # apply Canny edge detection
     canny = cv2.Canny(gray, lower, upper)
@@ -366,6 +392,25 @@ def detect_edges_iterative(img:np.array, mask:np.array) -> tuple[np.ndarray, lis
 
     return img_masked, contours
 
+def sticker_area_bounds(center_width:int) -> tuple[float, float]:
+    '''
+    A function that gets the smallest and largest acceptable areas for a Rubik's Cube sticker (+/- 1/3 of the expected length).
+    '''
+    lower_area = (center_width/3-center_width/9)**2
+    upper_area = (center_width/3+center_width/9)**2
+
+    return lower_area, upper_area
+
+def is_closed(contour:np.ndarray) -> bool:
+    '''
+    A function that checks whether the first and last points of a contour are within CLOSED_TOLERANCE pixels of each other.
+    '''
+    start, end = contour[0, 0], contour[-1, 0]
+    dx = int(start[0])-int(end[0])
+    dy = int(start[1])-int(end[1])
+
+    return dx*dx+dy*dy < CLOSED_TOLERANCE*CLOSED_TOLERANCE
+
 def is_rubik_square(contour:np.ndarray, center_width:int) -> bool:
     '''
     A function that looks at a given contour and determines whether or not it is the acceptable size and type for a Rubik's Cube sticker.
@@ -376,78 +421,88 @@ def is_rubik_square(contour:np.ndarray, center_width:int) -> bool:
 
     Output:
     bool:                   Evaluates to True if contour has an accaptable area and is closed; otherwise, False.
+
+    This is the single-contour reference for the vectorized filter in identify_stickers. Both take their bounds from sticker_area_bounds
+    and their closed test from CLOSED_TOLERANCE (as in is_closed), so a change to one must be made to the other.
     '''
-    # If the area of contour is within a given margin of error (+/- 1/3 of the expected length)...
-    if cv2.contourArea(contour) >= (center_width/3-center_width/9)**2 and cv2.contourArea(contour) <= (center_width/3+center_width/9)**2:
-        # Return True if the contour is closed; otherwise, return False.
-        return np.allclose(contour[0], contour[-1], 30, 30)
-    else:
-        return False
+    lower_area, upper_area = sticker_area_bounds(center_width)
+    area = cv2.contourArea(contour)
+
+    # Return True if the area of contour is within the margin of error and the contour is closed; otherwise, return False.
+    return lower_area <= area <= upper_area and is_closed(contour)
     
-def identify_stickers(img:np.ndarray, lower:int=0, upper:int=100) -> tuple[np.ndarray, list]:
+def identify_stickers(img:np.ndarray, lower:int=0, upper:int=100, downsample:int=2) -> tuple[np.ndarray, list]:
     '''
     A function that identifies the stickers on one face of a Rubik's Cube.
 
-    Input:
-    img (np.ndarray):           An RGB image that is a raw photo of one face of the Rubik's Cube. 
+    Inputs:
+    img (np.ndarray):             An RGB image that is a raw photo of one face of the Rubik's Cube. 
+    lower (int, default 0):       OPTIONAL, The lower threshold for cv2.Canny in detect_edges.
+    upper (int, default 100):     OPTIONAL, The upper threshold for cv2.Canny in detect_edges.
+    downsample (int, default 2):  OPTIONAL, The factor the crop is shrunk by before edge detection. 1 disables it.
+                                  With the default, contours come from a half-resolution edge map, so their points land on even coordinates;
+                                  pass downsample=1 for contours identical to full-resolution detection.
 
     Outputs:
-    img_cropped (np.ndarray):   img, after dynamic cropping and basic adjustments have been applied to it.
-    sticker_contours (list):    A list of the contours; these contours are the boundaries of the stckers.
-    lower (int, default 50):    OPTIONAL, The lower threshold for cv2.Canny in detect_edges.
-    upper (int, default 150):   OPTIONAL, The upper threshold for cv2.Canny in detect_edges.
+    img_cropped (np.ndarray):     img, after dynamic cropping and basic adjustments have been applied to it. This is a view that shares memory with img.
+    sticker_contours (list):      A list of the contours; these contours are the boundaries of the stckers.
 
     img is dynamically cropped to a center square plus one-eighth of the length of the largest side.
-    Canny edge detection is applied using detect_edges, and cv2.findContours finds the contours that could correspond to stickers.
+    Canny edge detection is applied using detect_edges on a downsampled copy of the crop, and cv2.findContours finds the contours that could correspond to stickers.
+    The contours are scaled back up, so they are in the coordinates of img_cropped.
 
-    The contours are processed using is_rubik_square, and then they are sorted by size. 
+    The contours are filtered with a vectorized copy of is_rubik_square (same sticker_area_bounds and CLOSED_TOLERANCE), and then they are sorted by size. 
     The nine largest (which will be the Rubik's cube stickers) are returned, along with the cropped version of img.
     '''
 
     # Get the dimensions to crop the img to its center plus some bound of error, adjusted dynamically by resolution.
-    imgheight, imgwidth, depth = np.shape(img)
+    imgheight, imgwidth, depth = img.shape
 
-    if imgwidth >= imgheight:
-        larger_side = imgwidth
-        smaller_side = imgheight
+    # Crop the img to the (cached) center region. This is a view into img; the OpenCV calls below accept it without a copy.
+    rows, cols, true_center_width = _crop_params(imgheight, imgwidth)
+    img_cropped = img[rows, cols]
 
-        border_top  = (smaller_side)//8
-        border_side = (larger_side)//2-3*border_top
-        true_center_width = 4*border_top
-        center_width = 6*border_top
+    # Detect edges in a downsampled copy of the img; stickers are large enough that the edges survive.
+    if downsample > 1:
+        img_small = cv2.resize(img_cropped, None, fx=1/downsample, fy=1/downsample, interpolation=cv2.INTER_AREA)
+    else:
+        img_small = img_cropped
+    edges = detect_edges(img_small, lower, upper)
+    contours, hierarchy = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
 
-    elif imgwidth < imgheight:
-        larger_side = imgheight
-        smaller_side = imgwidth
+    # Map the contours back to img_cropped's coordinates.
+    if downsample > 1:
+        for contour in contours:
+            contour *= downsample
 
-        border_side  = (smaller_side)//8
-        border_top = (larger_side)//2-3*border_side
-        true_center_width = 4*border_side
-        center_width = 6*border_side
+    # Compute every area once, and gather the first and last point of every contour into (C, 2) arrays.
+    areas = np.fromiter((cv2.contourArea(contour) for contour in contours), dtype=np.float64, count=len(contours))
+    starts = np.array([contour[0, 0] for contour in contours], dtype=np.int32).reshape(-1, 2)
+    ends = np.array([contour[-1, 0] for contour in contours], dtype=np.int32).reshape(-1, 2)
 
-    # Crop the img to the above dimensions.
-    img_cropped = np.copy(img)
-    img_cropped = img_cropped[border_top:border_top+center_width, border_side:border_side+center_width]
+    # Keep the contours that pass is_rubik_square, vectorized: an acceptable area, and closed (is_closed on every contour at once).
+    lower_area, upper_area = sticker_area_bounds(true_center_width)
+    area_mask = (areas >= lower_area) & (areas <= upper_area)
+    closed_mask = np.square(starts-ends).sum(axis=1) < CLOSED_TOLERANCE*CLOSED_TOLERANCE
+    closed_indices = np.flatnonzero(area_mask & closed_mask)
 
-    # Detect edges in the img.
-    edges = detect_edges(img_cropped, lower, upper)
-    contours, hierarchy = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+    # Get the largest nine contours without sorting all of them.
+    if len(closed_indices) > 9:
+        closed_indices = closed_indices[np.argpartition(-areas[closed_indices], 9)[:9]]
 
-    # Find all valid contours; sort them by size.
-    closed_contours = []
-    
-    for contour in contours:
-        if is_rubik_square(contour, true_center_width):
-            closed_contours.append(contour)
-    
-    # Sort the valid contours by size.
-    sorted_contours = sorted(closed_contours, key=cv2.contourArea, reverse=True)
-
-    # Get the largest nine contours.
-    sticker_contours = sorted_contours[:9]
+    # Sort the nine by size, using the precomputed areas.
+    sorted_indices = closed_indices[np.argsort(-areas[closed_indices], kind='stable')]
+    sticker_contours = [contours[i] for i in sorted_indices]
 
     return img_cropped, sticker_contours
 
+@functools.lru_cache(maxsize=4)
+def _point_tests(standard_length:int) -> tuple[tuple[int, int], ...]:
+    '''
+    A function that generates the nine (x, y) points correct_labels tests against, one per square of the standard format, for a crop of the given side length.
+    '''
+    return tuple((standard_length//4*(x_coord_ind+1), standard_length//4*(y_coord_ind+1)) for y_coord_ind in range(3) for x_coord_ind in range(3))
+
 def correct_labels(img_cropped:np.ndarray, sticker_contours:list, display:bool=False) -> tuple[dict[int,int], list[np.ndarray]]:
     '''
     A function that takes cropped of a face of a Rubik's Cube and the locations of its stickers generated by identify_stickers, 
@@ -468,21 +523,19 @@ def correct_labels(img_cropped:np.ndarray, sticker_contours:list, display:bool=F
     label_key (dict[int:int]):              A dict where each square's number is matched with its index in sticker_contours.
     sticker_contours (list[np.ndarray]):    A list of the contours of possible stickers on the Rubik's Cube; input with some new squares added.
     '''
-    # Preparation and coordinate generation for point tests. 
-    point_tests = []
+    # Preparation and coordinate generation for point tests (cached per crop size).
     label_key = {}
     standard_length = len(img_cropped)
-    for y_coord_ind in range(3):
-        for x_coord_ind in range(3):
-            x_coord = standard_length//4*(x_coord_ind+1)
-            y_coord = standard_length//4*(y_coord_ind+1)                
-            point_tests.append((x_coord,y_coord))
+    point_tests = _point_tests(standard_length)
     
     # Test each point with each contour; one should fit for each.
+    # A point can only be inside a contour if it is inside its bounding rectangle, so that cheap test runs first.
     for (cntindex, contour) in enumerate(sticker_contours):
-        for (ptindex, point) in enumerate(point_tests):
-            if cv2.pointPolygonTest(contour, point, False) > 0:
-                label_key[ptindex]= cntindex
+        rect_x, rect_y, rect_w, rect_h = cv2.boundingRect(contour)
+        for (ptindex, (point_x, point_y)) in enumerate(point_tests):
+            if rect_x <= point_x < rect_x+rect_w and rect_y <= point_y < rect_y+rect_h:
+                if cv2.pointPolygonTest(contour, (point_x, point_y), False) > 0:
+                    label_key[ptindex]= cntindex
 
     '''
     # Try using geometry to fill in empty spaces.             
@@ -498,39 +551,113 @@ def correct_labels(img_cropped:np.ndarray, sticker_contours:list, display:bool=F
 
     if display:
         # Display the contours on the image, if specified.
-        img_cropped_overwrite=np.copy(img_cropped)
-        for ptindex, cntindex in label_key.items():
-            contour_x, contour_y = get_center(sticker_contours[cntindex])
-            cv2.putText(img_cropped_overwrite, text=str(ptindex+1), org=(contour_x, contour_y), fontFace=cv2.FONT_HERSHEY_SIMPLEX, fontScale=1, color=(255,255,255), thickness=2, lineType=cv2.LINE_AA)
-            cv2.drawContours(img_cropped_overwrite, list(sticker_contours[cntindex]), -1, color=(33,237,255))
-            cv2.imshow('Stickers', img_cropped_overwrite)
+        cv2.imshow('Stickers', draw_labels(img_cropped, label_key, sticker_contours))
 
 
     return label_key, sticker_contours
 
+def draw_labels(img_cropped:np.ndarray, label_key:dict[int,int], sticker_contours:list[np.ndarray]) -> np.ndarray:
+    '''
+    A function that draws the results of correct_labels (each sticker's outline and number) onto a copy of img_cropped.
+    '''
+    img_cropped_overwrite=np.copy(img_cropped)
+    for ptindex, cntindex in label_key.items():
+        contour_x, contour_y = get_center(sticker_contours[cntindex])
+        cv2.putText(img_cropped_overwrite, text=str(ptindex+1), org=(contour_x, contour_y), fontFace=cv2.FONT_HERSHEY_SIMPLEX, fontScale=1, color=(255,255,255), thickness=2, lineType=cv2.LINE_AA)
+        cv2.drawContours(img_cropped_overwrite, sticker_contours, cntindex, color=(33,237,255))
+
+    return img_cropped_overwrite
+
+def process_frames(frame_queue:queue.Queue, result_queue:queue.Queue) -> None:
+    '''
+    A function, meant to run on its own thread, that runs identify_stickers and correct_labels on each frame put in frame_queue.
+    The latest result is kept in result_queue as (img_cropped, label_key, sticker_contours). Putting None in frame_queue stops it.
+    If processing a frame raises, the traceback is printed and that frame is skipped.
+
+    This keeps the (slow) contour detection from stalling the video feed. Drawing is left to the main thread, since cv2.imshow isn't thread-safe.
+    '''
+    # cv2.ocl.setUseOpenCL is per-thread, so it has to be set on the thread that runs detect_edges.
+    cv2.ocl.setUseOpenCL(USE_OPENCL)
+
+    while True:
+        img = frame_queue.get()
+        if img is None:
+            break
+        # A failure on one frame is reported, and the worker keeps waiting for the next one.
+        try:
+            img_cropped, sticker_contours = identify_stickers(img)
+            label_key, sticker_contours = correct_labels(img_cropped, sticker_contours)
+        except Exception:
+            traceback.print_exc()
+            continue
+
+        # Replace any result that hasn't been displayed yet, so this never blocks.
+        try:
+            result_queue.get_nowait()
+        except queue.Empty:
+            pass
+        result_queue.put_nowait((img_cropped, label_key, sticker_contours))
+
 ######## MAIN ########
 if __name__=="__main__":
+    # Pin OpenCV to its optimized code paths and one thread per available CPU. These match OpenCV's defaults;
+    # cv2.getNumberOfCPUs() respects CPU affinity and container quotas, unlike os.cpu_count().
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(cv2.getNumberOfCPUs())
+
+    # Offload detect_edges to OpenCL when OpenCV finds a device for it. process_frames applies this on the worker thread.
+    USE_OPENCL = cv2.ocl.haveOpenCL()
+
+    # Start the processing thread. Each queue holds at most one item, so a busy worker never builds a backlog.
+    frame_queue = queue.Queue(maxsize=1)
+    result_queue = queue.Queue(maxsize=1)
+    worker = threading.Thread(target=process_frames, args=(frame_queue, result_queue), daemon=True)
+    worker.start()
+
     # Initialize the camera object.
     cam = cv2.VideoCapture(1)
-    result, image = cam.read()
-    # Time delay to allow the shutter to autofocus.
-    time.sleep(0.5)
-    while result:
-        # Capture video frame by frame
-        result, image = cam.read()
+    cam.set(cv2.CAP_PROP_AUTOFOCUS, 1)
+    # A few warm-up reads let the shutter autofocus; the last one also allocates the frame buffer.
+    image = None
+    for _ in range(5):
+        result, image = cam.read(image)
+    while True:
+        # Capture video frame by frame, reusing the same buffer.
+        result, image = cam.read(image)
+        if not result:
+            break
         # Place guidelines on a copy of the image.
         image_guidelines = guidelines(image)
         # Display the resulting copy.
         cv2.imshow('VIDEO FEED', image_guidelines)
+
+        # Display the latest processed face, if there is one.
+        try:
+            image_cropped, label_key, sticker_contours = result_queue.get_nowait()
+            cv2.imshow('Stickers', draw_labels(image_cropped, label_key, sticker_contours))
+        except queue.Empty:
+            pass
         
+        # Poll the keyboard once per frame.
+        key = cv2.waitKey(1) & 0xFF
         # Use Q to quit.
-        if cv2.waitKey(81)  == ord('q'):
+        if key == ord('q'):
             break
         # Use P to capture and process images.
-        if cv2.waitKey(80) == ord('p'):
-            image_cropped, sticker_contours = identify_stickers(image)
-            label_key = correct_labels(image_cropped, sticker_contours, True)
-    # After the loop, release the camera object.
+        elif key == ord('p'):
+            # The next read overwrites image, so the worker gets its own copy. If it's still busy, the press is ignored.
+            try:
+                frame_queue.put_nowait(image.copy())
+            except queue.Full:
+                pass
+    # After the loop, stop the worker and release the camera object.
+    # Drop any frame still waiting so the stop signal never blocks.
+    try:
+        frame_queue.get_nowait()
+    except queue.Empty:
+        pass
+    frame_queue.put_nowait(None)
+    worker.join()
     cam.release()
     # Destroy all windows.
-    cv2.destroyAllWindows()
\ No newline at end of file
+    cv2.destroyAllWindows()